@@ -1,9 +1,189 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.contenttypes.models import ContentType
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.db.models import OuterRef, Subquery
+from django import forms
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
 
-from .models import Category, AuctionListing, Comment, Bid
+from .models import User, Category, AuctionListing, Comment, Bid, ProxyBid
 
-# Register your models here.
-admin.site.register(Category)
-admin.site.register(AuctionListing)
-admin.site.register(Comment)
-admin.site.register(Bid)
\ No newline at end of file
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that reads the planner's row estimate instead of running
+    COUNT(*) on large unfiltered tables (PostgreSQL only). Filtered
+    changelists and other databases fall back to an exact count.
+    """
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is None:
+            return super().count
+        connection = connections[self.object_list.db]
+        if connection.vendor == "postgresql" and not query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE relname = %s",
+                    [self.object_list.model._meta.db_table])
+                row = cursor.fetchone()
+            if row and row[0] >= self.estimate_threshold:
+                return int(row[0])
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+class ListingActionForm(ActionForm):
+    category = forms.ModelChoiceField(
+        queryset=Category.objects.all(),
+        required=False,
+        empty_label="-Select category-"
+    )
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ("name", "description")
+    search_fields = ("name",)
+
+
+@admin.register(AuctionListing)
+class AuctionListingAdmin(LargeTableAdmin):
+    list_display = ("title", "creator", "category", "price", "is_active", "created_at")
+    list_filter = ("is_active", "category")
+    list_select_related = ("creator", "category")
+    search_fields = ("title",)
+    raw_id_fields = ("creator",)
+    action_form = ListingActionForm
+    actions = ("close_listings", "reopen_listings", "recategorize_listings", "delete_listings")
+
+    def get_actions(self, request):
+        # delete_selected collects and renders every related row before
+        # confirming; delete_listings is the set-based replacement
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    def get_queryset(self, request):
+        # Annotate the highest bid so the changelist doesn't query per row
+        highest_bid = Bid.objects.filter(item=OuterRef("pk")).order_by("-amount").values("amount")[:1]
+        return super().get_queryset(request).annotate(highest_bid=Subquery(highest_bid))
+
+    @admin.display(description="Current price", ordering="highest_bid")
+    def price(self, obj):
+        return obj.current_price
+
+    @admin.action(description="Close selected listings", permissions=["change"])
+    def close_listings(self, request, queryset):
+        updated = queryset.order_by().update(is_active=False)
+        self.message_user(request, f"{updated} listings closed.", messages.SUCCESS)
+
+    @admin.action(description="Reopen selected listings", permissions=["change"])
+    def reopen_listings(self, request, queryset):
+        updated = queryset.order_by().update(is_active=True)
+        self.message_user(request, f"{updated} listings reopened.", messages.SUCCESS)
+
+    @admin.action(description="Move selected listings to category", permissions=["change"])
+    def recategorize_listings(self, request, queryset):
+        action_form = self.action_form(request.POST)
+        action_form.fields["action"].choices = self.get_action_choices(request)
+        category = action_form.cleaned_data["category"] if action_form.is_valid() else None
+        if category is None:
+            self.message_user(request, "Select a category to move the listings to.", messages.ERROR)
+            return
+        updated = queryset.order_by().update(category=category)
+        self.message_user(request, f"{updated} listings moved to {category}.", messages.SUCCESS)
+
+
+    @admin.action(description="Delete selected listings", permissions=["delete"])
+    def delete_listings(self, request, queryset):
+        listings = queryset.order_by().values("pk")
+        dependants = [
+            ("bids", Bid.objects.filter(item__in=listings)),
+            ("comments", Comment.objects.filter(item__in=listings)),
+            ("proxy bids", ProxyBid.objects.filter(item__in=listings)),
+            ("watchlist entries", User.watchlist.through.objects.filter(auctionlisting__in=listings)),
+        ]
+
+        if request.POST.get("post"):
+            with transaction.atomic(using=queryset.db):
+                self.log_bulk_deletion(request, queryset)
+                # Dependants first, then the listings; one DELETE per table
+                for _, dependant in dependants:
+                    dependant._raw_delete(queryset.db)
+                deleted = AuctionListing.objects.filter(pk__in=listings)._raw_delete(queryset.db)
+            self.message_user(request, f"{deleted} listings deleted.", messages.SUCCESS)
+            return None
+
+        # Confirmation page: per-model counts only, a fixed number of queries
+        select_across = request.POST.get("select_across") == "1"
+        return TemplateResponse(request, "admin/auctions/auctionlisting/delete_listings_confirmation.html", {
+            **self.admin_site.each_context(request),
+            "title": "Delete listings",
+            "opts": self.model._meta,
+            "media": self.media,
+            "model_count": [("listings", queryset.count())] + [
+                (label, dependant.count()) for label, dependant in dependants
+            ],
+            "selected": [] if select_across else request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            "select_across": select_across,
+            "action_checkbox_name": helpers.ACTION_CHECKBOX_NAME,
+        })
+
+    def log_bulk_deletion(self, request, queryset):
+        content_type_id = ContentType.objects.get_for_model(self.model).id
+        LogEntry.objects.bulk_create(
+            (
+                LogEntry(
+                    user_id=request.user.pk,
+                    content_type_id=content_type_id,
+                    object_id=str(pk),
+                    object_repr=title[:200],
+                    action_flag=DELETION,
+                    change_message="")
+                for pk, title in queryset.order_by().values_list("pk", "title")
+            ),
+            batch_size=1000)
+
+@admin.register(Bid)
+class BidAdmin(LargeTableAdmin):
+    list_display = ("item_title", "bidder", "amount", "created_at")
+    list_select_related = ("item", "bidder")
+    raw_id_fields = ("item", "bidder")
+
+    @admin.display(description="Listing", ordering="item__title")
+    def item_title(self, obj):
+        return obj.item.title
+
+
+@admin.register(ProxyBid)
+class ProxyBidAdmin(LargeTableAdmin):
+    list_display = ("item_title", "bidder", "max_amount", "updated_at")
+    list_select_related = ("item", "bidder")
+    raw_id_fields = ("item", "bidder")
+
+    @admin.display(description="Listing", ordering="item__title")
+    def item_title(self, obj):
+        return obj.item.title
+
+
+@admin.register(Comment)
+class CommentAdmin(LargeTableAdmin):
+    list_display = ("item_title", "author", "content", "created_at")
+    list_select_related = ("item", "author")
+    raw_id_fields = ("item", "author")
+
+    @admin.display(description="Listing", ordering="item__title")
+    def item_title(self, obj):
+        return obj.item.title
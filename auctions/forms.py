@@ -0,0 +1,48 @@
+from django import forms
+
+from .models import Category
+
+
+class ListingForm(forms.Form):
+    title = forms.CharField(
+        label="Title",
+        required=True,
+        max_length=50
+    )
+    description = forms.CharField(
+        label="Description",
+        required=True,
+        max_length=500,
+        widget=forms.Textarea
+    )
+    initial_price = forms.DecimalField(
+        label="Initial price [€]",
+        min_value=0,
+        required=True
+    )
+    image_url = forms.URLField(
+        label="Image URL",
+        required=False
+    )
+    category = forms.ModelChoiceField(
+        queryset=Category.objects.all(),
+        required=False,
+        empty_label="-Select category-"
+    )
+
+class BiddingForm(forms.Form):
+    amount = forms.DecimalField(
+        label="Amount",
+        min_value=0,
+        required=True
+    )
+    is_proxy = forms.BooleanField(
+        label="Bid automatically up to this amount",
+        required=False
+    )
+
+class CommentForm(forms.Form):
+    content = forms.CharField(
+        label="Add Comment",
+        required=True
+    )
@@ -0,0 +1,77 @@
+import statistics
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client
+from django.urls import reverse
+
+from auctions.models import User, AuctionListing
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure bytes sent and render time of the listing index page. "
+        "Rows are created in a transaction that is rolled back afterwards. "
+        "Compare profiles with --settings=commerce.settings_production "
+        "(set DJANGO_SECRET_KEY and run collectstatic first)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=500,
+            help="Number of listings on the page."
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Number of timed renders per encoding."
+        )
+
+    def handle(self, *args, **options):
+        for option in ("rows", "repeat"):
+            if options[option] < 1:
+                raise CommandError(f"--{option} must be at least 1.")
+
+        # Without DEBUG, {% static %} needs the manifest written by collectstatic
+        if (not settings.DEBUG and isinstance(staticfiles_storage, ManifestFilesMixin)
+                and not staticfiles_storage.manifest_storage.exists(staticfiles_storage.manifest_name)):
+            raise CommandError("Static files manifest not found; run collectstatic first.")
+
+        hosts = [host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"]
+        client = Client(HTTP_HOST=hosts[0] if hosts else "localhost")
+        url = reverse("index")
+
+        with transaction.atomic():
+            creator = User.objects.create_user("benchmark", "benchmark@example.com", "benchmark")
+            AuctionListing.objects.bulk_create(
+                AuctionListing(
+                    title=f"Listing {i}",
+                    description=f"Benchmark listing number {i}",
+                    image_url=f"https://example.com/images/{i}.jpg",
+                    creator=creator,
+                    initial_price=Decimal("10.00") + i)
+                for i in range(options["rows"])
+            )
+
+            self.stdout.write(f"GET {url} with {options['rows']} listings ({settings.SETTINGS_MODULE})")
+            for encoding in ("identity", "gzip"):
+                client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+                timings = []
+                for _ in range(options["repeat"]):
+                    start = time.perf_counter()
+                    response = client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+                    timings.append(time.perf_counter() - start)
+
+                self.stdout.write(
+                    f"  {encoding:>8}: {len(response.content):>8} bytes "
+                    f"(Content-Encoding: {response.get('Content-Encoding', 'none')}), "
+                    f"median {statistics.median(timings) * 1000:.1f} ms")
+
+            transaction.set_rollback(True)
@@ -0,0 +1,108 @@
+import os
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Runs in a fresh interpreter so imports are measured cold
+STARTUP_SCRIPT = """
+import os, time
+start = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", {settings_module!r})
+import django
+django.setup()
+setup_done = time.perf_counter()
+{warm_up}
+warm_up_done = time.perf_counter()
+
+from django.test import Client
+client = Client(HTTP_HOST={host!r})
+for path in {paths!r}:
+    request_start = time.perf_counter()
+    status = client.get(path).status_code
+    first = time.perf_counter() - request_start
+    request_start = time.perf_counter()
+    client.get(path)
+    second = time.perf_counter() - request_start
+    print("REQUEST", path, status, first, second)
+print("PHASE setup", setup_done - start)
+print("PHASE warm-up", warm_up_done - setup_done)
+"""
+
+
+class Command(BaseCommand):
+    help = "Report per-module import time and first-request latency of a cold worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            default=["/", "/categories/"],
+            help="URL paths to request after startup (default: / and /categories/)."
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=20,
+            help="Number of slowest modules to list."
+        )
+        parser.add_argument(
+            "--no-warm-up",
+            action="store_true",
+            help="Skip auctions.warmup.warm_up() to measure an unprimed worker."
+        )
+
+    def handle(self, *args, **options):
+        warm_up = "" if options["no_warm_up"] else "from auctions.warmup import warm_up; warm_up()"
+        # The test client must use a host that passes ALLOWED_HOSTS validation
+        hosts = [host.lstrip(".") for host in settings.ALLOWED_HOSTS if host != "*"]
+        script = STARTUP_SCRIPT.format(
+            settings_module=os.environ["DJANGO_SETTINGS_MODULE"],
+            warm_up=warm_up,
+            host=hosts[0] if hosts else "localhost",
+            paths=options["paths"],
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Startup script failed:\n{result.stderr[-2000:]}")
+
+        modules = parse_importtime(result.stderr)
+        modules.sort(key=lambda module: module[1], reverse=True)
+
+        self.stdout.write(f"Slowest imports (cumulative, {len(modules)} modules total):")
+        for name, cumulative, own in modules[:options["limit"]]:
+            self.stdout.write(f"  {cumulative / 1000:9.1f} ms  {own / 1000:8.1f} ms self  {name}")
+
+        self.stdout.write("")
+        for line in result.stdout.splitlines():
+            kind, *fields = line.split()
+            if kind == "PHASE":
+                self.stdout.write(f"{fields[0]:>10}: {float(fields[1]) * 1000:9.1f} ms")
+            elif kind == "REQUEST":
+                path, status, first, second = fields
+                self.stdout.write(
+                    f"GET {path} [{status}]: first {float(first) * 1000:.1f} ms, "
+                    f"second {float(second) * 1000:.1f} ms")
+
+
+def parse_importtime(output):
+    """
+    Parse `python -X importtime` output into (module, cumulative_us, self_us)
+    tuples.
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(cumulative), int(own)))
+    return modules
@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that leaves responses smaller than COMPRESSION_MIN_SIZE
+    bytes uncompressed. Compression itself, including the random padding
+    that mitigates BREACH, is Django's.
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+        return super().process_response(request, response)
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auctions', '0006_delete_watchlist_user_watchlist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProxyBid',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('max_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('bidder', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='proxy_bids', to=settings.AUTH_USER_MODEL)),
+                ('item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='proxy_bids', to='auctions.auctionlisting')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['item', '-max_amount', 'updated_at'], name='proxy_bid_max_idx')],
+                'constraints': [models.UniqueConstraint(fields=('bidder', 'item'), name='unique_proxy_bid_per_bidder')],
+            },
+        ),
+    ]
@@ -1,9 +1,22 @@
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 
 from django.core.exceptions import ValidationError
 from decimal import Decimal
 
+CATEGORY_CACHE_KEY = "auctions:categories"
+
+# Upper bound on how stale a worker's category list can get: save/delete
+# only invalidates the cache the changing process can see, which with the
+# default per-process local-memory cache is that process alone
+CATEGORY_CACHE_TIMEOUT = 60
+
+# Smallest step by which an automatic (proxy) bid outbids a competitor
+BID_INCREMENT = Decimal("1.00")
+
 
 class User(AbstractUser):
     watchlist = models.ManyToManyField(
@@ -19,6 +32,22 @@ class Category(models.Model):
     def __str__(self):
         return f"{self.name}"
 
+    @classmethod
+    def get_cached(cls):
+        """
+        Return all categories ordered by name. Changes are visible at once
+        with a shared cache backend (CACHES), otherwise in other workers
+        after at most CATEGORY_CACHE_TIMEOUT seconds.
+        """
+        return cache.get_or_set(
+            CATEGORY_CACHE_KEY,
+            lambda: list(cls.objects.order_by("name")),
+            CATEGORY_CACHE_TIMEOUT)
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_cache(sender, **kwargs):
+    cache.delete(CATEGORY_CACHE_KEY)
+
 class AuctionListing(models.Model):
     title = models.CharField(max_length=64)
     description = models.CharField(max_length=500)
@@ -37,7 +66,10 @@ class AuctionListing(models.Model):
         
     @property
     def current_price(self):
-        highest_bid = self.bids.order_by("-amount").first()
+        # Querysets may annotate the highest bid amount to avoid a query per row
+        if hasattr(self, "highest_bid"):
+            return self.highest_bid if self.highest_bid is not None else self.initial_price
+        highest_bid = self.bids.order_by("-amount", "created_at").first()
         if highest_bid:
             return highest_bid.amount
         else:
@@ -45,9 +77,58 @@ class AuctionListing(models.Model):
         
     @property
     def highest_bidder(self):
-        highest_bid = self.bids.order_by("-amount").first()
+        highest_bid = self.bids.order_by("-amount", "created_at").first()
         return highest_bid.bidder if highest_bid else None
 
+    def resolve_proxy_bids(self):
+        """
+        Place the single bid needed to settle all competing proxy bids.
+
+        Only the two highest maximums matter: the leader pays one increment
+        over the runner-up (or over the current bid), capped at its own
+        maximum. Both are read from the ordered (item, max_amount) index, so
+        resolution costs two index lookups regardless of how many proxies
+        exist, and at most one Bid row is created.
+
+        Ties: between proxies with equal maximums the earliest maximum wins.
+        A literal bid equal to the leader's maximum wins over the proxy,
+        because the proxy can't bid above its maximum and equal Bid rows
+        rank by when they were placed; the literal bid is already placed.
+        """
+        with transaction.atomic():
+            # Lock the listing so concurrent resolutions are serialized
+            AuctionListing.objects.select_for_update().get(pk=self.pk)
+
+            proxies = list(self.proxy_bids.order_by("-max_amount", "updated_at")[:2])
+            if not proxies:
+                return None
+            leader = proxies[0]
+            runner_up = proxies[1] if len(proxies) > 1 else None
+
+            highest_bid = self.bids.order_by("-amount", "created_at").first()
+            current_amount = Decimal(str(highest_bid.amount)) if highest_bid else None
+
+            if highest_bid is None:
+                price = self.initial_price
+            elif highest_bid.bidder_id == leader.bidder_id:
+                price = current_amount
+            else:
+                # A literal bid at or above the leader's maximum can't be beaten
+                # (see the tie rule above)
+                if current_amount >= leader.max_amount:
+                    return None
+                price = current_amount + BID_INCREMENT
+
+            if runner_up is not None:
+                price = max(price, runner_up.max_amount + BID_INCREMENT)
+            price = min(price, leader.max_amount)
+
+            if highest_bid is not None and highest_bid.bidder_id == leader.bidder_id \
+                    and price <= current_amount:
+                return None
+
+            return Bid.objects.create(bidder=leader.bidder, amount=price, item=self)
+
 class Bid(models.Model):
     bidder = models.ForeignKey(User, on_delete=models.CASCADE, related_name="bids")
     amount = models.FloatField()
@@ -55,12 +136,29 @@ class Bid(models.Model):
     item = models.ForeignKey(AuctionListing, on_delete=models.CASCADE, related_name="bids")
 
     def __str__(self):
-        return f"{self.bidder} - {self.item.name}: {self.amount}"
+        return f"{self.bidder} - {self.item.title}: {self.amount}"
 
     def clean(self):
         if self.amount <= self.item.current_price:
             raise ValidationError(f"Bid must be higher than current price ({self.item.current_price}).")
 
+class ProxyBid(models.Model):
+    bidder = models.ForeignKey(User, on_delete=models.CASCADE, related_name="proxy_bids")
+    item = models.ForeignKey(AuctionListing, on_delete=models.CASCADE, related_name="proxy_bids")
+    max_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["bidder", "item"], name="unique_proxy_bid_per_bidder"),
+        ]
+        indexes = [
+            models.Index(fields=["item", "-max_amount", "updated_at"], name="proxy_bid_max_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.bidder} - {self.item.title}: up to {self.max_amount}"
+
 class Comment(models.Model):
     content = models.TextField(max_length=500)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="comments")
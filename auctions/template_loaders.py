@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from django.apps import apps
+from django.template.loaders.filesystem import Loader as FilesystemLoader
+
+
+class WhitespaceTrimmingLoader(FilesystemLoader):
+    """
+    Loader for the app's own page templates (auctions/*) that strips
+    indentation and blank lines from their source. Wrapped in the cached
+    loader, the trimming happens once per template instead of on every
+    render.
+
+    Every other template (admin, other apps) is left to the regular
+    app directories loader listed after this one: trimming would alter
+    untrimmed {% blocktranslate %} msgids and <pre>/<textarea> contents.
+    """
+
+    def get_dirs(self):
+        return [Path(apps.get_app_config("auctions").path) / "templates"]
+
+    def get_template_sources(self, template_name):
+        if template_name.startswith("auctions/"):
+            yield from super().get_template_sources(template_name)
+
+    def get_contents(self, origin):
+        contents = super().get_contents(origin)
+        return "\n".join(line.strip() for line in contents.splitlines() if line.strip())
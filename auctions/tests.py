@@ -1,3 +1,503 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from datetime import timedelta
+from io import StringIO
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse
+from django.template.loader import get_template
+from django.db import OperationalError, connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.test import Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .management.commands.profile_startup import parse_importtime
+from .forms import BiddingForm
+from .middleware import CompressionMiddleware
+from .models import User, AuctionListing, Bid, Category, Comment, ProxyBid
+from .warmup import auction_templates, warm_up
+
+
+class ProxyBidTestCase(TestCase):
+
+    def setUp(self):
+        self.creator = User.objects.create_user("creator", "creator@example.com", "password")
+        self.alice = User.objects.create_user("alice", "alice@example.com", "password")
+        self.bob = User.objects.create_user("bob", "bob@example.com", "password")
+        self.carol = User.objects.create_user("carol", "carol@example.com", "password")
+        self.listing = AuctionListing.objects.create(
+            title="Lamp",
+            description="Desk lamp",
+            creator=self.creator,
+            initial_price=Decimal("10.00"))
+
+    def place_proxy(self, bidder, max_amount, minutes_ago=0):
+        proxy = ProxyBid.objects.create(bidder=bidder, item=self.listing, max_amount=max_amount)
+        # auto_now is bypassed by update(), which lets tests pin the ordering
+        ProxyBid.objects.filter(pk=proxy.pk).update(
+            updated_at=timezone.now() - timedelta(minutes=minutes_ago))
+        return proxy
+
+    def test_single_proxy_opens_at_initial_price(self):
+        self.place_proxy(self.alice, Decimal("50.00"))
+        self.listing.resolve_proxy_bids()
+
+        self.assertEqual(self.listing.bids.count(), 1)
+        self.assertEqual(self.listing.highest_bidder, self.alice)
+        self.assertEqual(self.listing.current_price, 10.0)
+
+    def test_leader_pays_one_increment_over_runner_up(self):
+        self.place_proxy(self.alice, Decimal("50.00"))
+        self.place_proxy(self.bob, Decimal("30.00"))
+        self.listing.resolve_proxy_bids()
+
+        self.assertEqual(self.listing.highest_bidder, self.alice)
+        self.assertEqual(self.listing.current_price, 31.0)
+
+    def test_price_is_capped_at_leader_maximum(self):
+        self.place_proxy(self.alice, Decimal("30.50"))
+        self.place_proxy(self.bob, Decimal("30.00"))
+        self.listing.resolve_proxy_bids()
+
+        self.assertEqual(self.listing.highest_bidder, self.alice)
+        self.assertEqual(self.listing.current_price, 30.5)
+
+    def test_tie_goes_to_earliest_maximum(self):
+        self.place_proxy(self.bob, Decimal("40.00"), minutes_ago=1)
+        self.place_proxy(self.alice, Decimal("40.00"), minutes_ago=5)
+        self.listing.resolve_proxy_bids()
+
+        self.assertEqual(self.listing.highest_bidder, self.alice)
+        self.assertEqual(self.listing.current_price, 40.0)
+
+    def test_competing_proxies_resolve_to_single_bid(self):
+        self.place_proxy(self.alice, Decimal("25.00"), minutes_ago=3)
+        self.place_proxy(self.bob, Decimal("80.00"), minutes_ago=2)
+        self.place_proxy(self.carol, Decimal("60.00"), minutes_ago=1)
+        self.listing.resolve_proxy_bids()
+
+        self.assertEqual(self.listing.bids.count(), 1)
+        self.assertEqual(self.listing.highest_bidder, self.bob)
+        self.assertEqual(self.listing.current_price, 61.0)
+
+    def test_resolution_is_idempotent(self):
+        self.place_proxy(self.alice, Decimal("50.00"))
+        self.place_proxy(self.bob, Decimal("30.00"))
+        self.listing.resolve_proxy_bids()
+
+        self.assertIsNone(self.listing.resolve_proxy_bids())
+        self.assertEqual(self.listing.bids.count(), 1)
+
+    def test_proxy_outbids_literal_bid(self):
+        self.place_proxy(self.alice, Decimal("50.00"))
+        self.listing.resolve_proxy_bids()
+        Bid.objects.create(bidder=self.bob, amount=20, item=self.listing)
+        self.listing.resolve_proxy_bids()
+
+        self.assertEqual(self.listing.highest_bidder, self.alice)
+        self.assertEqual(self.listing.current_price, 21.0)
+
+    def test_literal_bid_above_maximum_wins(self):
+        self.place_proxy(self.alice, Decimal("50.00"))
+        self.listing.resolve_proxy_bids()
+        Bid.objects.create(bidder=self.bob, amount=60, item=self.listing)
+
+        self.assertIsNone(self.listing.resolve_proxy_bids())
+        self.assertEqual(self.listing.highest_bidder, self.bob)
+        self.assertEqual(self.listing.current_price, 60.0)
+
+    def test_literal_bid_equal_to_maximum_wins(self):
+        # Deliberate rule: the proxy can't go above its maximum and the
+        # literal bid was placed first at that amount
+        self.place_proxy(self.alice, Decimal("50.00"))
+        self.listing.resolve_proxy_bids()
+        Bid.objects.create(bidder=self.bob, amount=50, item=self.listing)
+
+        self.assertIsNone(self.listing.resolve_proxy_bids())
+        self.assertEqual(self.listing.highest_bidder, self.bob)
+        self.assertEqual(self.listing.bids.filter(amount=50).count(), 1)
+
+    def test_bid_view_stores_proxy_and_responds_to_competitor(self):
+        self.client.force_login(self.alice)
+        self.client.post(reverse("bid", args=[self.listing.id]), {"amount": "100", "is_proxy": "on"})
+        self.client.force_login(self.bob)
+        self.client.post(reverse("bid", args=[self.listing.id]), {"amount": "40"})
+
+        self.assertEqual(ProxyBid.objects.get(bidder=self.alice).max_amount, Decimal("100.00"))
+        self.assertEqual(self.listing.highest_bidder, self.alice)
+        self.assertEqual(self.listing.current_price, 41.0)
+        self.assertEqual(self.listing.bids.count(), 3)
+
+
+    def test_bid_matching_proxy_opening_price_is_rejected(self):
+        self.client.force_login(self.alice)
+        self.client.post(reverse("bid", args=[self.listing.id]), {"amount": "100", "is_proxy": "on"})
+        self.client.force_login(self.bob)
+        response = self.client.post(reverse("bid", args=[self.listing.id]), {"amount": "10"})
+
+        self.assertContains(response, "Bid must be bigher than current price")
+        self.assertEqual(self.listing.bids.count(), 1)
+
+        self.client.post(reverse("bid", args=[self.listing.id]), {"amount": "11"})
+        self.assertEqual(self.listing.highest_bidder, self.alice)
+        self.assertEqual(self.listing.current_price, 12.0)
+
+    def test_equal_bids_go_to_earliest_bidder(self):
+        Bid.objects.create(bidder=self.alice, amount=15, item=self.listing)
+        Bid.objects.create(bidder=self.bob, amount=15, item=self.listing)
+
+        self.assertEqual(self.listing.highest_bidder, self.alice)
+
+
+    def test_bid_is_validated_against_price_committed_meanwhile(self):
+        # Interleave deterministically: bob's bid commits while alice's
+        # request is between loading the listing and taking the lock
+        is_valid = BiddingForm.is_valid
+
+        def competing_bid_then_validate(form):
+            Bid.objects.create(bidder=self.bob, amount=30, item=self.listing)
+            return is_valid(form)
+
+        self.client.force_login(self.alice)
+        with mock.patch.object(BiddingForm, "is_valid", autospec=True, side_effect=competing_bid_then_validate):
+            response = self.client.post(reverse("bid", args=[self.listing.id]), {"amount": "20"})
+
+        self.assertContains(response, "Bid must be bigher than current price (30.0 €)")
+        self.assertEqual(self.listing.highest_bidder, self.bob)
+        self.assertEqual(self.listing.bids.count(), 1)
+
+    def test_competing_proxy_resolved_meanwhile_is_seen(self):
+        is_valid = BiddingForm.is_valid
+
+        def competing_proxy_then_validate(form):
+            self.place_proxy(self.bob, Decimal("80.00"))
+            self.listing.resolve_proxy_bids()
+            return is_valid(form)
+
+        self.client.force_login(self.alice)
+        with mock.patch.object(BiddingForm, "is_valid", autospec=True, side_effect=competing_proxy_then_validate):
+            self.client.post(reverse("bid", args=[self.listing.id]), {"amount": "50", "is_proxy": "on"})
+
+        self.assertEqual(self.listing.highest_bidder, self.bob)
+        self.assertEqual(self.listing.current_price, 51.0)
+        self.assertEqual(self.listing.bids.count(), 2)
+
+    def test_lock_timeout_returns_form_error(self):
+        self.client.force_login(self.alice)
+        with mock.patch.object(AuctionListing, "resolve_proxy_bids",
+                               side_effect=OperationalError("database is locked")):
+            response = self.client.post(reverse("bid", args=[self.listing.id]), {"amount": "20"})
+
+        self.assertContains(response, "Too many bids at once, please try again.")
+        self.assertFalse(self.listing.bids.exists())
+
+@unittest.skipUnless(connection.features.has_select_for_update, "backend has no row locks")
+class ConcurrentProxyBidTestCase(TransactionTestCase):
+
+    def setUp(self):
+        self.creator = User.objects.create_user("creator", "creator@example.com", "password")
+        self.bidders = [
+            User.objects.create_user(f"bidder{i}", f"bidder{i}@example.com", "password")
+            for i in range(2)
+        ]
+        self.listing = AuctionListing.objects.create(
+            title="Lamp",
+            description="Desk lamp",
+            creator=self.creator,
+            initial_price=Decimal("10.00"))
+
+    def test_concurrent_proxies_are_serialized(self):
+        barrier = threading.Barrier(len(self.bidders))
+        url = reverse("bid", args=[self.listing.id])
+
+        def place_proxy(bidder, max_amount):
+            client = Client()
+            client.force_login(bidder)
+            barrier.wait()
+            try:
+                client.post(url, {"amount": max_amount, "is_proxy": "on"})
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=place_proxy, args=(self.bidders[0], "50")),
+            threading.Thread(target=place_proxy, args=(self.bidders[1], "30")),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(ProxyBid.objects.count(), 2)
+        self.assertEqual(self.listing.highest_bidder, self.bidders[0])
+        self.assertEqual(self.listing.current_price, 31.0)
+        self.assertLessEqual(self.listing.bids.count(), 2)
+
+
+class ListingAdminTestCase(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin", "admin@example.com", "password")
+        self.category = Category.objects.create(name="Home", description="Home goods")
+        self.listings = [
+            AuctionListing.objects.create(
+                title=f"Item {i}",
+                description="Item",
+                creator=self.admin,
+                initial_price=Decimal("5.00"))
+            for i in range(5)
+        ]
+        Bid.objects.create(bidder=self.admin, amount=7, item=self.listings[0])
+        self.client.force_login(self.admin)
+        self.changelist_url = reverse("admin:auctions_auctionlisting_changelist")
+
+    def run_action(self, action, **extra):
+        data = {
+            "action": action,
+            "_selected_action": [listing.id for listing in self.listings],
+            **extra
+        }
+        return self.client.post(self.changelist_url, data, follow=True)
+
+    def test_changelist_query_count_does_not_grow_with_rows(self):
+        with self.assertNumQueries(6):
+            response = self.client.get(self.changelist_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Item 4")
+
+    def test_changelist_shows_annotated_price(self):
+        response = self.client.get(self.changelist_url)
+        self.assertEqual(response.context["cl"].result_list.get(pk=self.listings[0].pk).highest_bid, 7.0)
+
+    def test_close_and_reopen_listings(self):
+        self.run_action("close_listings")
+        self.assertFalse(AuctionListing.objects.filter(is_active=True).exists())
+
+        self.run_action("reopen_listings")
+        self.assertFalse(AuctionListing.objects.filter(is_active=False).exists())
+
+    def test_recategorize_listings(self):
+        self.run_action("recategorize_listings", category=self.category.id)
+        self.assertEqual(AuctionListing.objects.filter(category=self.category).count(), 5)
+
+    def test_recategorize_without_category_changes_nothing(self):
+        AuctionListing.objects.update(category=self.category)
+        response = self.run_action("recategorize_listings")
+
+        self.assertContains(response, "Select a category to move the listings to.")
+        self.assertEqual(AuctionListing.objects.filter(category=self.category).count(), 5)
+
+    def test_delete_listings_asks_for_confirmation(self):
+        Comment.objects.create(content="Nice", author=self.admin, item=self.listings[0])
+        self.admin.watchlist.add(self.listings[1])
+        ProxyBid.objects.create(bidder=self.admin, item=self.listings[2], max_amount=Decimal("9.00"))
+
+        response = self.run_action("delete_listings")
+        self.assertContains(response, "Are you sure you want to delete the selected listings?")
+        self.assertContains(response, "<li>Bids: 1</li>", html=True)
+        self.assertEqual(AuctionListing.objects.count(), 5)
+
+        self.run_action("delete_listings", post="yes")
+        self.assertFalse(AuctionListing.objects.exists())
+        self.assertFalse(Bid.objects.exists())
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(ProxyBid.objects.exists())
+        self.assertFalse(self.admin.watchlist.exists())
+        self.assertEqual(LogEntry.objects.filter(action_flag=DELETION).count(), 5)
+
+    def test_delete_listings_across_filtered_selection(self):
+        AuctionListing.objects.filter(pk=self.listings[0].pk).update(is_active=False)
+        self.client.post(
+            f"{self.changelist_url}?is_active__exact=1",
+            {"action": "delete_listings", "select_across": "1", "_selected_action": [self.listings[1].id], "post": "yes"})
+
+        self.assertEqual(list(AuctionListing.objects.values_list("pk", flat=True)), [self.listings[0].pk])
+
+    def test_delete_confirmation_query_count_does_not_grow_with_selection(self):
+        self.listings += [
+            AuctionListing.objects.create(
+                title=f"Extra {i}",
+                description="Item",
+                creator=self.admin,
+                initial_price=Decimal("5.00"))
+            for i in range(20)
+        ]
+        for listing in self.listings:
+            Bid.objects.create(bidder=self.admin, amount=8, item=listing)
+
+        def confirmation_queries(listings):
+            with CaptureQueriesContext(connection) as context:
+                self.client.post(self.changelist_url, {
+                    "action": "delete_listings",
+                    "_selected_action": [listing.id for listing in listings]
+                })
+            return len(context)
+
+        self.assertEqual(confirmation_queries(self.listings[:2]), confirmation_queries(self.listings))
+
+    def test_delete_selected_is_not_offered(self):
+        response = self.client.get(self.changelist_url)
+        self.assertNotIn("delete_selected", dict(response.context["action_form"].fields["action"].choices))
+
+    def test_view_only_staff_cannot_run_actions(self):
+        moderator = User.objects.create_user("moderator", "moderator@example.com", "password", is_staff=True)
+        moderator.user_permissions.add(Permission.objects.get(codename="view_auctionlisting"))
+        self.client.force_login(moderator)
+
+        for action in ("close_listings", "recategorize_listings", "delete_listings"):
+            self.run_action(action, category=self.category.id, post="yes")
+
+        self.assertEqual(AuctionListing.objects.filter(is_active=True, category=None).count(), 5)
+
+    def test_bid_str_uses_listing_title(self):
+        self.assertEqual(str(Bid.objects.get()), "admin - Item 0: 7.0")
+
+
+class WarmUpTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        Category.objects.create(name="Toys", description="Toys")
+
+    def test_warm_up_primes_category_cache(self):
+        # Closing connections would end the test transaction on some backends
+        with mock.patch.object(connections, "close_all") as close_all:
+            warm_up()
+        close_all.assert_called_once()
+        with self.assertNumQueries(0):
+            self.assertEqual([category.name for category in Category.get_cached()], ["Toys"])
+
+    def test_warm_up_logs_failures(self):
+        with mock.patch.object(connections, "close_all") as close_all, \
+                mock.patch.object(Category, "get_cached", side_effect=RuntimeError("boom")), \
+                self.assertLogs("auctions.warmup", "WARNING"):
+            warm_up()
+        close_all.assert_called_once()
+
+    def test_warm_up_inside_event_loop_runs_off_loop(self):
+        # ASGI servers import commerce.asgi, and so call warm_up(), while
+        # their event loop is running
+        calls = []
+
+        def record(name):
+            def call(*args, **kwargs):
+                try:
+                    asyncio.get_running_loop()
+                    calls.append((name, "on loop"))
+                except RuntimeError:
+                    calls.append((name, "off loop"))
+            return call
+
+        async def main():
+            warm_up()
+
+        with mock.patch.object(connections, "close_all", side_effect=record("close_all")), \
+                mock.patch.object(Category, "get_cached", side_effect=record("get_cached")), \
+                self.assertNoLogs("auctions.warmup", "WARNING"):
+            asyncio.run(main())
+
+        self.assertEqual(calls, [("get_cached", "off loop"), ("close_all", "off loop")])
+
+    def test_failing_connection_close_is_logged(self):
+        with mock.patch.object(connections, "close_all", side_effect=RuntimeError("boom")), \
+                self.assertLogs("auctions.warmup", "WARNING"):
+            warm_up()
+
+    def test_category_cache_is_invalidated_on_change(self):
+        Category.get_cached()
+        Category.objects.create(name="Books", description="Books")
+        self.assertEqual([category.name for category in Category.get_cached()], ["Books", "Toys"])
+
+    def test_auction_templates_are_listed(self):
+        self.assertIn("auctions/layout.html", auction_templates())
+
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        450 |   django.urls\n"
+        )
+        self.assertEqual(parse_importtime(output), [("django.urls", 450, 120)])
+
+
+@override_settings(COMPRESSION_MIN_SIZE=1024)
+class CompressionMiddlewareTestCase(TestCase):
+
+    def get_response(self, accept_encoding, body):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        middleware = CompressionMiddleware(lambda request: HttpResponse(body))
+        return middleware(request)
+
+    def test_small_response_is_not_compressed(self):
+        response = self.get_response("gzip", "x" * 1000)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_gzip_above_threshold(self):
+        body = "<td>listing</td>" * 200
+        response = self.get_response("gzip", body)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content).decode(), body)
+
+    def test_gzip_output_is_randomly_padded(self):
+        body = "<td>listing</td>" * 200
+        first = self.get_response("gzip", body).content
+        second = self.get_response("gzip", body).content
+        self.assertEqual(gzip.decompress(first), gzip.decompress(second))
+        self.assertNotEqual(first, second)
+
+
+@override_settings(TEMPLATES=[{
+    "BACKEND": "django.template.backends.django.DjangoTemplates",
+    "OPTIONS": {
+        "loaders": [
+            ("django.template.loaders.cached.Loader", [
+                "auctions.template_loaders.WhitespaceTrimmingLoader",
+                "django.template.loaders.app_directories.Loader",
+            ]),
+        ],
+    },
+}])
+class WhitespaceTrimmingLoaderTestCase(TestCase):
+
+    def test_indentation_is_trimmed(self):
+        source = get_template("auctions/index.html").template.source
+        self.assertNotIn("    <", source)
+        self.assertNotIn("\n\n", source)
+
+    def test_other_templates_are_loaded_unchanged(self):
+        template = get_template("admin/delete_selected_confirmation.html").template
+        with open(template.origin.name, encoding="utf-8") as source_file:
+            self.assertEqual(template.source, source_file.read())
+
+
+class BenchmarkListingsTestCase(TestCase):
+
+    def test_repeat_must_be_positive(self):
+        with self.assertRaisesMessage(CommandError, "--repeat must be at least 1."):
+            call_command("benchmark_listings", repeat=0, stdout=StringIO())
+
+    @override_settings(
+        DEBUG=False,
+        STATIC_ROOT=os.path.join(tempfile.gettempdir(), "commerce-no-collectstatic"),
+        STORAGES={
+            "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+            "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"},
+        })
+    def test_missing_manifest_is_reported(self):
+        with self.assertRaisesMessage(CommandError, "run collectstatic first"):
+            call_command("benchmark_listings", rows=1, repeat=1, stdout=StringIO())
+
+    def test_reports_bytes_per_encoding(self):
+        stdout = StringIO()
+        call_command("benchmark_listings", rows=3, repeat=1, stdout=stdout)
+        self.assertIn("gzip:", stdout.getvalue())
+        self.assertFalse(AuctionListing.objects.exists())
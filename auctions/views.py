@@ -1,56 +1,16 @@
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
-from django.db import IntegrityError
+from django.db import IntegrityError, OperationalError, transaction
 from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse
-from django import forms
 
 from decimal import Decimal
 
-from .models import User, AuctionListing, Bid, Category, Comment
+from .forms import ListingForm, BiddingForm, CommentForm
+from .models import User, AuctionListing, Bid, Category, Comment, ProxyBid
 
 
-class ListingForm(forms.Form):
-    title = forms.CharField(
-        label="Title",
-        required=True,
-        max_length=50
-    )
-    description = forms.CharField(
-        label="Description",
-        required=True,
-        max_length=500,
-        widget=forms.Textarea
-    )
-    initial_price = forms.DecimalField(
-        label="Initial price [€]",
-        min_value=0,
-        required=True
-    )
-    image_url = forms.URLField(
-        label="Image URL",
-        required=False
-    )
-    category = forms.ModelChoiceField(
-        queryset=Category.objects.all(),
-        required=False,
-        empty_label="-Select category-"
-    )
-
-class BiddingForm(forms.Form):
-    amount = forms.DecimalField(
-        label="Amount",
-        min_value=0,
-        required=True
-    )
-
-class CommentForm(forms.Form):
-    content = forms.CharField(
-        label="Add Comment",
-        required=True
-    )
-
 def index(request):
     listings = AuctionListing.objects.all()
 
@@ -128,7 +88,7 @@ def create_listing(request):
             category_id = new_listing_form.cleaned_data["category"].id
         else:
             return render(request, "auctions/create_listing.html", {
-                "categories": Category.objects.all(),
+                "categories": Category.get_cached(),
                 "new_listing_form": new_listing_form
             })
 
@@ -149,7 +109,7 @@ def create_listing(request):
 
 
     return render(request, "auctions/create_listing.html", {
-        "categories": Category.objects.all(),
+        "categories": Category.get_cached(),
         "new_listing_form": ListingForm()
     })
         
@@ -171,11 +131,16 @@ def listing(request, listing_id):
         new_comment.save()
         return redirect("listing", listing_id=listing_id)
 
+    proxy_bid = None
+    if request.user.is_authenticated:
+        proxy_bid = listing.proxy_bids.filter(bidder=request.user).first()
+
     return render(request, "auctions/listing.html", {
         "listing": listing,
         "comments": listing.comments.order_by("created_at"),
         "comment_form": CommentForm(),
-        "bidding_form": BiddingForm()
+        "bidding_form": BiddingForm(),
+        "proxy_bid": proxy_bid
     })
 
 @login_required
@@ -201,32 +166,53 @@ def bid(request, listing_id):
             return redirect("listing", listing_id=listing.id)
 
         bidding_form = BiddingForm(request.POST)
-        if bidding_form.is_valid():
-            amount = bidding_form.cleaned_data["amount"]
-
-            current_price = listing.current_price
-            if (listing.initial_price != current_price and amount <= current_price) or amount < listing.initial_price:
-                bidding_form.add_error(
-                    "amount",
-                    f"Bid must be bigher than current price ({current_price:,} €)")
-                return render(request, "auctions/listing.html", {
-                    "listing": listing,
-                    "comment_form": CommentForm(),
-                    "bidding_form": bidding_form
-                })
+        if not bidding_form.is_valid():
+            return render(request, "auctions/listing.html", {
+                "listing": listing,
+                "comment_form": CommentForm(),
+                "bidding_form": bidding_form
+            })
+        amount = bidding_form.cleaned_data["amount"]
 
-        else:
+        # Validate, store the bid and let automatic bids respond while the
+        # listing is locked, so concurrent bids can't pass on a stale price
+        try:
+            with transaction.atomic():
+                listing = AuctionListing.objects.select_for_update().get(id=listing.id)
+                if not listing.is_active:
+                    return redirect("listing", listing_id=listing.id)
+
+                current_price = listing.current_price
+                if (listing.bids.exists() and amount <= current_price) or amount < listing.initial_price:
+                    bidding_form.add_error(
+                        "amount",
+                        f"Bid must be bigher than current price ({current_price:,} €)")
+                    return render(request, "auctions/listing.html", {
+                        "listing": listing,
+                        "comment_form": CommentForm(),
+                        "bidding_form": bidding_form
+                    })
+
+                if bidding_form.cleaned_data["is_proxy"]:
+                    ProxyBid.objects.update_or_create(
+                        bidder=request.user,
+                        item=listing,
+                        defaults={"max_amount": amount})
+                else:
+                    new_bid = Bid(
+                        bidder=request.user,
+                        amount=amount,
+                        item=listing)
+                    new_bid.save()
+                listing.resolve_proxy_bids()
+        except OperationalError:
+            # Lock wait timed out (SQLite: "database is locked")
+            bidding_form.add_error("amount", "Too many bids at once, please try again.")
             return render(request, "auctions/listing.html", {
                 "listing": listing,
                 "comment_form": CommentForm(),
                 "bidding_form": bidding_form
             })
-        
-        new_bid = Bid(
-            bidder=request.user,
-            amount=amount,
-            item=listing)
-        new_bid.save()
         return redirect("listing", listing_id=listing_id)
 
 @login_required
@@ -252,5 +238,5 @@ def watchlist(request):
 
 def categories(request):
     return render(request, "auctions/categories.html", {
-        "categories": Category.objects.all().order_by("name")
+        "categories": Category.get_cached()
     })
\ No newline at end of file
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+import threading
+from pathlib import Path
+
+from django.apps import apps
+from django.db import connections
+from django.template.loader import get_template
+from django.urls import get_resolver
+
+from .models import Category
+
+logger = logging.getLogger(__name__)
+
+
+def auction_templates():
+    """Names of every template shipped with the auctions app."""
+    template_dir = Path(apps.get_app_config("auctions").path) / "templates"
+    return sorted(
+        path.relative_to(template_dir).as_posix()
+        for path in template_dir.rglob("*.html")
+    )
+
+
+def warm_up():
+    """
+    Prime the per-process state the first requests would otherwise build:
+    the URL resolver, compiled templates and the category cache. Called by
+    commerce/wsgi.py and commerce/asgi.py before the worker serves traffic.
+
+    Failures are logged, never raised: a cold worker is better than one
+    that can't start.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        prime_worker()
+    else:
+        # ASGI servers such as uvicorn import the application inside their
+        # event loop, where the ORM refuses to run; warm up from a thread
+        thread = threading.Thread(target=prime_worker, name="warm-up")
+        thread.start()
+        thread.join()
+
+
+def prime_worker():
+    try:
+        # Importing the URLconf pulls in the views and forms as well
+        get_resolver().reverse_dict
+
+        for template_name in auction_templates():
+            get_template(template_name)
+
+        Category.get_cached()
+    except Exception:
+        logger.warning("Worker warm-up failed; continuing without it.", exc_info=True)
+
+    try:
+        # Don't hand an open connection to processes forked from this one
+        # (e.g. gunicorn --preload)
+        connections.close_all()
+    except Exception:
+        logger.warning("Could not close database connections after warm-up.", exc_info=True)
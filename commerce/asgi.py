@@ -2,6 +2,9 @@
 ASGI config for commerce project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The auctions app is warmed up (URLs, templates, category cache) before the
+callable is handed to the server, so the first requests after a worker
+starts don't pay for it.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
@@ -14,3 +17,7 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'commerce.settings')
 
 application = get_asgi_application()
+
+from auctions.warmup import warm_up  # noqa: E402  (needs the app registry)
+
+warm_up()
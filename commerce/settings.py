@@ -79,9 +79,25 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'OPTIONS': {
+            # SQLite has no row locks (select_for_update is a no-op), so take
+            # the write lock when a transaction starts: concurrent bids then
+            # wait for each other instead of validating against a stale price
+            'transaction_mode': 'IMMEDIATE',
+            # Seconds to wait for that lock before raising OperationalError
+            'timeout': 10,
+        },
     }
 }
 
+# Cache
+# https://docs.djangoproject.com/en/3.0/topics/cache/
+#
+# Without CACHES each worker process uses its own local-memory cache, so
+# Category.get_cached() only sees category changes made by other workers
+# once its entry expires. Configure a shared backend (e.g. Redis or
+# Memcached) when running several workers to invalidate them immediately.
+
 AUTH_USER_MODEL = 'auctions.User'
 
 # Password validation
@@ -121,3 +137,11 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/3.0/howto/static-files/
 
 STATIC_URL = '/static/'
+
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+
+# Response compression (auctions.middleware.CompressionMiddleware)
+
+# Responses smaller than this many bytes are sent uncompressed
+COMPRESSION_MIN_SIZE = 1024
@@ -0,0 +1,49 @@
+"""
+Production settings for commerce project.
+
+Use with DJANGO_SETTINGS_MODULE=commerce.settings_production and set
+DJANGO_SECRET_KEY (and DJANGO_ALLOWED_HOSTS) in the environment. Run
+`manage.py collectstatic` before starting workers: the manifest storage
+serves hashed file names, which can be cached by the web server or CDN
+with far-future expiry headers.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+
+DEBUG = False
+
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Set the DJANGO_SECRET_KEY environment variable.')
+
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost').split(',')
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    # Before any middleware that reads or writes the response body
+    'auctions.middleware.CompressionMiddleware',
+] + MIDDLEWARE[1:]
+
+# Compiled templates are kept in memory. The auctions page templates have
+# their indentation trimmed once on load; all others are loaded unchanged.
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'auctions.template_loaders.WhitespaceTrimmingLoader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage',
+    },
+}